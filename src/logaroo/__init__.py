@@ -1,6 +1,7 @@
 from .exceptions import (
     LogarooException,
     LogarooMissingCodeException,
+    LogarooDuplicateCodeException,
 )
 from .level import Level
 from .message import Message
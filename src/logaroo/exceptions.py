@@ -9,8 +9,15 @@ class LogarooMissingCodeException(LogarooException):
 
     def __init__(self, code: str) -> None:
         self.code = code
-        self.message = f"logging code '{self.code}' is missing."
-        super().__init__(self.message)
+        super().__init__(code)
+
+    @property
+    def message(self) -> str:
+        """The error message, built only when it is needed."""
+        return f"logging code '{self.code}' is missing."
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class LogarooDuplicateCodeException(LogarooException):
@@ -18,5 +25,12 @@ class LogarooDuplicateCodeException(LogarooException):
 
     def __init__(self, code: str) -> None:
         self.code = code
-        self.message = f"logging code '{self.code}' is duplicated."
-        super().__init__(self.message)
+        super().__init__(code)
+
+    @property
+    def message(self) -> str:
+        """The error message, built only when it is needed."""
+        return f"logging code '{self.code}' is duplicated."
+
+    def __str__(self) -> str:
+        return self.message
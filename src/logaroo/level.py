@@ -1,7 +1,7 @@
-from enum import Enum
+from enum import IntEnum
 
 
-class Level(Enum):
+class Level(IntEnum):
     """
     Enum representing different logging levels.
     """
@@ -1,8 +1,13 @@
-from datetime import datetime
+from collections.abc import Callable, Iterable, ValuesView
 from io import TextIOWrapper
 import json
-from typing import Any
+from queue import SimpleQueue
+import threading
+import time
+from typing import TextIO
+import weakref
 from logaroo import LogarooMissingCodeException, Level, Message
+from logaroo.message import LogCtrl
 from logaroo.exceptions import LogarooDuplicateCodeException
 
 ORDERED_LEVELS = [
@@ -13,6 +18,9 @@ ORDERED_LEVELS = [
     Level.CRITICAL,
 ]
 
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+FILE_BUFFER_SIZE = 65536
+
 
 class Logger:
     """
@@ -20,135 +28,238 @@ class Logger:
 
     Attributes:
         name (str): The name of the logger.
-        messages (list): A list of log messages associated with the logger.
-        level (Level): The log level (e.g., INFO, WARNING, ERROR). Defaults to "INFO".
+        messages (ValuesView[Message]): A read-only view of the log messages associated with the logger.
+        level (Level): The log level (e.g., INFO, WARNING, ERROR). Defaults to Level.INFO.
         verbosity (int): The verbosity level of the logger. Defaults to 0.
         filename (str | None): The name of the file to log messages to. Defaults to None.
         stdout (bool): Whether to log to stdout. Defaults to True.
+        stream (TextIO | None): The stream to log to instead of stdout. Defaults to None.
         with_timestamp (bool): Whether to include a timestamp in the log messages. Defaults to False.
         max_messages (int): The maximum number of messages to log per code. Defaults to 100.
+        flush_each (bool): Whether to flush the log file after every message. Defaults to False.
+        buffer_size (int): The size in bytes of the log file write buffer. Defaults to 65536.
+        retain_entries (bool): Whether to keep logged entries for the entries property. Defaults to False.
+        async_write (bool): Whether to write to the log file from a background thread. Defaults to False.
     """
 
+    __slots__ = (
+        "name",
+        "_level",
+        "_level_value",
+        "verbosity",
+        "filename",
+        "stdout",
+        "stream",
+        "with_timestamp",
+        "max_messages",
+        "flush_each",
+        "buffer_size",
+        "retain_entries",
+        "async_write",
+        "max_messages_previously_met_for_code",
+        "_messages_by_code",
+        "_entry_counts",
+        "_ts_cache",
+        "file_handle",
+        "_finalizer",
+        "__weakref__",
+        "_entries",
+    )
+
     def __init__(
         self,
         name: str,
-        level: Level = Level.INFO,
+        level: Level | str = Level.INFO,
         verbosity: int = 0,
         filename: str | None = None,
         stdout: bool = True,
         with_timestamp: bool = False,
         max_messages: int = 100,
+        flush_each: bool = False,
+        buffer_size: int = FILE_BUFFER_SIZE,
+        stream: TextIO | None = None,
+        retain_entries: bool = False,
+        async_write: bool = False,
     ) -> None:
         """
         Initializes the Logger instance.
 
         Args:
             name (str): The name of the logger.
-            level (str): The log level (e.g., INFO, WARNING, ERROR). Defaults to "INFO".
+            level (Level | str, optional): The log level (e.g., INFO, WARNING, ERROR), as a Level or its name. Defaults to Level.INFO.
             verbosity (int, optional): The verbosity level of the logger. Defaults to 0.
             filename (str | None, optional): The name of the file to log messages to. Defaults to None.
             stdout (bool, optional): Whether to log to stdout. Defaults to True.
             with_timestamp (bool, optional): Whether to include a timestamp in the log messages. Defaults to False.
             max_messages (int, optional): The maximum number of messages to log per code. Defaults to 100.
+            flush_each (bool, optional): Whether to flush the log file after every message. Defaults to False.
+            buffer_size (int, optional): The size in bytes of the log file write buffer. Defaults to 65536.
+            stream (TextIO | None, optional): The stream to log to instead of stdout. Defaults to None,
+                which writes to whatever sys.stdout is at the time of each call.
+            retain_entries (bool, optional): Whether to keep logged entries for the entries property.
+                Defaults to False, which keeps only the per-code counts used by get_summary.
+            async_write (bool, optional): Whether to write to the log file from a background thread,
+                so log calls only queue their line. Defaults to False.
         """
         self.name: str = name
-        self.level: Level = level
+        self.level = level
         self.verbosity: int = verbosity
         self.filename: str | None = filename
         self.stdout: bool = stdout
+        self.stream: TextIO | None = stream
         self.with_timestamp: bool = with_timestamp
         self.max_messages: int = max_messages
-        self.max_messages_previously_met_for_code: list[str] = []
-        self.messages: list[Message] = []
+        self.flush_each: bool = flush_each
+        self.buffer_size: int = buffer_size
+        self.retain_entries: bool = retain_entries
+        self.async_write: bool = async_write
+        self.max_messages_previously_met_for_code: set[str] = set()
+        self._messages_by_code: dict[str, Message] = {}
+        self._entry_counts: dict[str, int] = {}
+        self._ts_cache: tuple[int, str] = (-1, "")
 
         if self.filename:
-            self.file_handle: TextIOWrapper | None = open(self.filename, "w")
+            self.file_handle: TextIOWrapper | BackgroundWriter | None = open(
+                self.filename, "w", buffering=self.buffer_size
+            )
+            if self.async_write:
+                self.file_handle = BackgroundWriter(self.file_handle)
+            # Closes the file when the logger is garbage collected or at exit,
+            # without the exit hook keeping the logger alive.
+            self._finalizer: weakref.finalize | None = weakref.finalize(
+                self, self.file_handle.close
+            )
         else:
             self.file_handle = None
+            self._finalizer = None
 
-        self.entries: list[Entry] = []
+        self._entries: "list[Entry]" = []
 
-    def _get_message(self, code: str) -> Message | None:
+    @property
+    def level(self) -> Level:
+        """
+        The log level of the logger.
         """
-        Retrieves a message by its code, level, and verbosity.
-        If level is above the logger's level, the message is not logged.
-        If verbosity is above the logger's verbosity, the message is not logged.
+        return self._level
 
-        Args:
-            code (str): The code associated with the log message.
+    @level.setter
+    def level(self, level: Level | str) -> None:
+        self._level: Level = Level[level] if isinstance(level, str) else level
+        self._level_value: int = int(self._level)
 
-        Returns:
-            Message | None: The corresponding Message object or None if not found.
+    @property
+    def messages(self) -> ValuesView[Message]:
         """
+        A read-only view of the messages added to the logger, in the order they were added.
+        """
+        return self._messages_by_code.values()
 
-        if code not in [message.code for message in self.messages]:
-            raise LogarooMissingCodeException(code)
+    @property
+    def entries(self) -> "list[Entry]":
+        """
+        The logged message entries, if the logger retains them.
+        """
+        return self._entries
 
-        for message in self.messages:
-            if message.code == code:
-                if ORDERED_LEVELS.index(message.level) >= ORDERED_LEVELS.index(
-                    self.level
-                ):
-                    if message.verbosity <= self.verbosity:
-                        return message
-        return
+    def _get_timestamp(self) -> str:
+        """
+        Returns the current timestamp.
+        The formatted string is cached and reused for calls within the same second.
 
-    def _get_entry_count_for_code(self, code: str) -> int:
+        Returns:
+            str: The current timestamp.
+        """
+        second = time.time_ns() // 1_000_000_000
+        last_second, timestamp = self._ts_cache
+        if second != last_second:
+            timestamp = time.strftime(TIMESTAMP_FORMAT, time.localtime(second))
+            self._ts_cache = (second, timestamp)
+        return timestamp
+
+    def disabled_for(self, code: str) -> bool:
         """
-        Retrieves the count of log entries for a specific code.
+        Checks whether logging a code would be dropped, without doing any logging work.
+        Use this to skip building expensive arguments for messages that will not be logged.
 
         Args:
             code (str): The code associated with the log message.
 
         Returns:
-            int: The count of log entries for the specified code.
+            bool: True if the message is filtered out by level or verbosity,
+            or its code has reached the maximum number of messages.
         """
-        return len([entry for entry in self.entries if entry.message.code == code])
+        message = self._messages_by_code.get(code)
+        if message is None:
+            raise LogarooMissingCodeException(code)
+
+        return (
+            message._level_value < self._level_value
+            or message.verbosity > self.verbosity
+            or code in self.max_messages_previously_met_for_code
+        )
 
     def log(self, code: str, *args, **kwargs) -> None:  # type: ignore
         """
         Logs a message with the given code and arguments.
-
+        If the message level is below the logger's level, or its verbosity is
+        above the logger's verbosity, the call returns before doing any work.
+        Once the maximum number of messages has been reported for a code,
+        further calls for that code are only counted for the summary.
+        A max_messages of -1 logs every call.
 
         Args:
             code (str): The code associated with the log message.
             *args: Positional arguments to format the message.
             **kwargs: Keyword arguments to format the message.
         """
-        message = self._get_message(code)
-
-        context: dict[str, Any] = kwargs.copy()
-
-        if message:
-            if self.file_handle:
-                context["file_handle"] = self.file_handle
-
-            context["stdout"] = self.stdout
+        message = self._messages_by_code.get(code)
+        if message is None:
+            raise LogarooMissingCodeException(code)
 
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S%z")
-            if self.with_timestamp:
-                context["timestamp"] = timestamp
+        if (
+            message._level_value < self._level_value
+            or message.verbosity > self.verbosity
+        ):
+            return
 
-            context["max_messages"] = self.max_messages
-            context["max_messages_reached"] = False
-            context["max_messages_previously_met_for_code"] = False
+        entry_count = self._entry_counts.get(code, 0)
+        if code in self.max_messages_previously_met_for_code:
+            self._entry_counts[code] = entry_count + 1
+            return
 
-            entry_count = self._get_entry_count_for_code(code)
-            if entry_count >= self.max_messages or self.max_messages == -1:
-                context["max_messages_reached"] = True
-                context["max_messages_previously_met_for_code"] = (
-                    code in self.max_messages_previously_met_for_code
-                )
-                self.max_messages_previously_met_for_code.append(code)
+        timestamp = None
+        if self.with_timestamp:
+            timestamp = self._get_timestamp()
 
-            output: str = message.log(*args, **context)  # type: ignore
-            self.entries.append(Entry(output, message, timestamp))
+        max_messages_reached = (
+            self.max_messages != -1 and entry_count >= self.max_messages
+        )
+        if max_messages_reached:
+            self.max_messages_previously_met_for_code.add(code)
+
+        ctrl = LogCtrl(
+            self.file_handle,
+            self.stdout,
+            timestamp,
+            self.max_messages,
+            max_messages_reached,
+            False,
+            self.stream,
+        )
+        output = message._emit(args, kwargs, ctrl)
+        if self.flush_each:
+            self.flush()
+        if self.retain_entries:
+            # Appending is amortized O(1). It measured slightly slower than writing
+            # into a preallocated list, but avoids tracking a separate length.
+            self._entries.append(Entry(output, message, timestamp))
+        self._entry_counts[code] = entry_count + 1
 
     def add_message(
         self,
         code: str,
         description: str,
-        level: Level,
+        level: Level | str,
         verbosity: int = 0,
         format: str = "{}",
     ) -> None:
@@ -167,30 +278,57 @@ class Logger:
         Args:
             message (Message): The Message object to add.
         """
-        if message.code in [m.code for m in self.messages]:
+        if message.code in self._messages_by_code:
             raise LogarooDuplicateCodeException(message.code)
-        self.messages.append(message)
+        self._messages_by_code[message.code] = message
 
     def add_messages(
         self,
-        messages: list[Message],
+        messages: Iterable[Message],
     ) -> None:
         """
         Adds a list of messages to the logger.
+        All codes are checked before any message is added, so a duplicate code
+        leaves the logger unchanged.
 
         Args:
-            messages (list[Message]): A list of Message objects to add.
+            messages (Iterable[Message]): The Message objects to add.
         """
+        new_messages: dict[str, Message] = {}
         for message in messages:
-            self._add_message_object(message)
+            code = message.code
+            if code in new_messages or code in self._messages_by_code:
+                raise LogarooDuplicateCodeException(code)
+            new_messages[code] = message
+        self._messages_by_code.update(new_messages)
+
+    def flush(self) -> None:
+        """
+        Flushes buffered messages to the log file, if one is open.
+        """
+        if self.file_handle is not None:
+            self.file_handle.flush()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the log file, if one is open.
+        This also happens automatically when the logger is deleted or the interpreter exits.
+        """
+        # The finalizer is missing if the logger failed to initialize.
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer is not None:
+            try:
+                finalizer()
+            finally:
+                self._finalizer = None
+                self.file_handle = None
 
     def __del__(self):
         """
         Cleans up the logger instance.
-        Closes the file handle if it was opened.
+        Flushes and closes the file handle if it was opened.
         """
-        if self.file_handle:
-            self.file_handle.close()
+        self.close()
 
     def get_summary(self) -> str:
         """
@@ -199,28 +337,26 @@ class Logger:
         Returns:
             str: A summary of the logged message entries.
         """
-        summary = "Message summary:\n"
-        for level in ORDERED_LEVELS:
-            count = len(
-                [entry for entry in self.entries if entry.message.level == level]
-            )
-            summary += f"  {level.name} = {count}\n"
-
-        summary += "\n"
-        summary += "Message codes:\n"
-        codes: dict[str, list[Message]] = {}
-        for entry in self.entries:
-            code = entry.message.code
-            if code not in codes:
-                codes[code] = []
-            codes[code].append(entry.message)
-
-        for code, messages in codes.items():
-            count = len(messages)
-            first_message: Message = messages[0]
-            summary += f"  {code}: {first_message.format} = {count}\n"
-
-        return summary.strip()
+        # The per-code counts are kept up to date by log(), so the summary
+        # costs one step per code rather than one per entry.
+        message_counts: dict[Message, int] = {
+            self._messages_by_code[code]: count
+            for code, count in self._entry_counts.items()
+        }
+        level_counts: dict[Level, int] = {level: 0 for level in ORDERED_LEVELS}
+        for message, count in message_counts.items():
+            level_counts[message.level] += count
+
+        parts: list[str] = ["Message summary:"]
+        for level, count in level_counts.items():
+            parts.append(f"  {level.name} = {count}")
+
+        parts.append("")
+        parts.append("Message codes:")
+        for message, count in message_counts.items():
+            parts.append(f"  {message.code}: {message.format} = {count}")
+
+        return "\n".join(parts)
 
     def to_json(self) -> str:
         """
@@ -241,6 +377,7 @@ class Logger:
                 "messages": [message.to_dict() for message in self.messages],
             },
             indent=4,
+            check_circular=False,
         )
 
 
@@ -251,10 +388,133 @@ class Entry:
     Attributes:
         output (str): The formatted log message.
         message (Message): The original message object.
-        timestamp (str): The timestamp when the log entry was created.
+        timestamp (str | None): The timestamp when the log entry was created, or None if timestamps are disabled.
     """
 
-    def __init__(self, output: str, message: Message, timestamp: str):
+    __slots__ = ("output", "message", "timestamp")
+
+    def __init__(self, output: str, message: Message, timestamp: str | None):
         self.output = output
         self.message = message
         self.timestamp = timestamp
+
+
+class BackgroundWriter:
+    """
+    Writes to a file from a background thread.
+    Lines are queued by the caller, and the thread writes all lines queued
+    since its last write in one call. An error raised by the file in the thread
+    is raised again by the next flush or close in the caller.
+
+    Attributes:
+        file_handle (TextIOWrapper): The file to write to.
+    """
+
+    __slots__ = ("file_handle", "_queue", "_thread", "_error")
+
+    def __init__(self, file_handle: TextIOWrapper) -> None:
+        """
+        Initializes the BackgroundWriter instance and starts its thread.
+
+        Args:
+            file_handle (TextIOWrapper): The file to write to.
+        """
+        self.file_handle = file_handle
+        self._queue: SimpleQueue[str | threading.Event | None] = SimpleQueue()
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self) -> None:
+        """
+        Writes queued lines until the writer is closed.
+        Flush requests are handled after the lines queued with them are written.
+        """
+        queue = self._queue
+        try:
+            while True:
+                items = [queue.get()]
+                while not queue.empty():
+                    items.append(queue.get())
+
+                lines = [item for item in items if isinstance(item, str)]
+                if lines:
+                    self._write_lines(lines)
+                for item in items:
+                    if item is None:
+                        return
+                    if isinstance(item, threading.Event):
+                        self._call(self.file_handle.flush)
+                        item.set()
+        finally:
+            # Releases waiting callers and closes the file even if the thread fails.
+            while not queue.empty():
+                item = queue.get()
+                if isinstance(item, threading.Event):
+                    item.set()
+            self._call(self.file_handle.close)
+
+    def _write_lines(self, lines: list[str]) -> None:
+        """
+        Writes lines to the file in one call.
+        If that fails, the lines are written one by one so a bad line does not lose the others.
+
+        Args:
+            lines (list[str]): The lines to write.
+        """
+        try:
+            self.file_handle.write("".join(lines))
+        except Exception:
+            for line in lines:
+                self._call(self.file_handle.write, line)
+
+    def _call(self, function: Callable[..., object], *args: str) -> None:
+        """
+        Calls a file method in the thread, keeping the first error it raises.
+
+        Args:
+            function (Callable): The file method to call.
+            *args: The arguments to call it with.
+        """
+        try:
+            function(*args)
+        except Exception as error:
+            if self._error is None:
+                self._error = error
+
+    def _raise_error(self) -> None:
+        """
+        Raises the error kept by the thread, if any, in the caller.
+        """
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def write(self, text: str) -> None:
+        """
+        Queues text to be written to the file.
+        Errors from earlier writes are left to flush and close, so queuing never fails.
+
+        Args:
+            text (str): The text to write.
+        """
+        self._queue.put(text)
+
+    def flush(self) -> None:
+        """
+        Waits until all queued text is written and the file is flushed.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                break
+        self._raise_error()
+
+    def close(self) -> None:
+        """
+        Writes all queued text, closes the file and stops the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
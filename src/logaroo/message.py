@@ -1,7 +1,145 @@
-from io import StringIO
-from typing import Any
+from string import Formatter
+import sys
+from typing import Any, Callable, NamedTuple, TextIO
 from logaroo.level import Level
 
+# Source of the function that formats and writes a message. It is compiled once
+# per Message with its constants bound as globals, and {render} and {line}
+# replaced by the expressions that build the output, and the line to write
+# without a timestamp, for that message's format.
+_EMIT_SOURCE = """
+def _emit(args, kwargs, ctrl):
+    (
+        file_handle,
+        stdout,
+        timestamp,
+        max_messages,
+        max_messages_reached,
+        max_messages_previously_met_for_code,
+        stream,
+    ) = ctrl
+
+    output = {render}
+
+    if timestamp:
+        output = timestamp + " - " + output
+
+    if max_messages_previously_met_for_code:
+        return output
+
+    if max_messages_reached:
+        output_to_print = f"WARNING: Maximum number of messages ({{max_messages}}) reached for code {{CODE}}.\\n"
+        if timestamp:
+            output_to_print = timestamp + " - " + output_to_print
+    elif timestamp:
+        output_to_print = output + "\\n"
+    else:
+        output_to_print = {line}
+
+    if stdout:
+        target = stream or sys.stdout
+        if target is not None:
+            target.write(output_to_print)
+    if file_handle:
+        file_handle.write(output_to_print)
+
+    return output
+"""
+
+_STATIC_RENDER = "STATIC_OUTPUT"
+_STATIC_LINE = "STATIC_LINE"
+_FORMAT_RENDER = "RENDER_OUTPUT(args, kwargs)"
+_FORMAT_LINE = 'output + "\\n"'
+
+# Number of renders after which a message compiles an emit function with its
+# format inlined as an f-string.
+HOT_MESSAGE_THRESHOLD = 32
+
+_CONVERSIONS: dict[str, Callable[[Any], str]] = {"r": repr, "s": str, "a": ascii}
+
+# Kinds of the field that follows the literal text of a format chunk.
+TEXT = 0
+POS = 1
+KW = 2
+
+# A parsed format chunk: literal text, then the kind of the field that follows it
+# (TEXT for trailing text), its argument index or keyword name, conversion and spec.
+FormatChunk = tuple[str, int, int | str | None, str | None, str]
+
+
+def _parse_format(format: str) -> list[FormatChunk] | None:
+    """
+    Parses a format string once into literal text and replacement fields.
+
+    Args:
+        format (str): The log message format.
+
+    Returns:
+        list[FormatChunk] | None: The parsed chunks, or None if the format uses
+        attribute or index lookups, nested specs, or is invalid, in which case
+        it is left to str.format.
+    """
+    chunks: list[FormatChunk] = []
+    auto_index = 0
+    manual_index = False
+    try:
+        parsed = list(Formatter().parse(format))
+    except ValueError:
+        return None
+
+    for literal, field_name, format_spec, conversion in parsed:
+        if field_name is None:
+            chunks.append((literal, TEXT, None, None, ""))
+            continue
+        if (
+            "." in field_name
+            or "[" in field_name
+            or "{" in format_spec
+            or (conversion is not None and conversion not in _CONVERSIONS)
+        ):
+            return None
+
+        key: int | str
+        if field_name == "":
+            kind, key = POS, auto_index
+            auto_index += 1
+        elif field_name.isdecimal():
+            kind, key = POS, int(field_name)
+            manual_index = True
+        else:
+            kind, key = KW, field_name
+        chunks.append((literal, kind, key, conversion, format_spec))
+
+    if auto_index and manual_index:
+        return None
+    return chunks
+
+
+class LogCtrl(NamedTuple):
+    """
+    Control state passed from a logger to a message, kept apart from the format arguments.
+
+    Attributes:
+        file_handle (TextIO | None): The file to log the message to. Defaults to None.
+        stdout (bool): Whether to log to stdout. Defaults to True.
+        timestamp (str | None): The timestamp to prefix the message with. Defaults to None.
+        max_messages (int): The maximum number of messages to log per code. Defaults to 0.
+        max_messages_reached (bool): Whether the maximum has been reached for the code. Defaults to False.
+        max_messages_previously_met_for_code (bool): Whether the maximum was already reported. Defaults to False.
+        stream (TextIO | None): The stream to log to instead of sys.stdout. Defaults to None.
+    """
+
+    file_handle: TextIO | None = None
+    stdout: bool = True
+    timestamp: str | None = None
+    max_messages: int = 0
+    max_messages_reached: bool = False
+    max_messages_previously_met_for_code: bool = False
+    stream: TextIO | None = None
+
+
+EmitFunction = Callable[[tuple[Any, ...], dict[str, Any], LogCtrl], str]
+
 
 class Message:
     """
@@ -15,77 +153,213 @@ class Message:
         verbosity (int): The verbosity level of the log message.
     """
 
+    __slots__ = (
+        "format",
+        "code",
+        "description",
+        "level",
+        "verbosity",
+        "_level_value",
+        "_is_static",
+        "_chunks",
+        "_prefix",
+        "_suffix",
+        "_static_output",
+        "_emit",
+        "_hits",
+    )
+
     def __init__(
         self,
         format: str,
         code: str,
         description: str,
-        level: Level,
+        level: Level | str,
         verbosity: int = 0,
     ) -> None:
         """
         Initializes the Message instance.
+        The format, code and description are interned, so messages registered with
+        the same strings share them and codes compare by identity in dict lookups.
 
         Args:
             format (str): The log message format.
             code (str): The code associated with the log message.
             description (str): A description of the log message.
-            level (Level): The log level (e.g., INFO, WARNING, ERROR).
+            level (Level | str): The log level (e.g., INFO, WARNING, ERROR), as a Level or its name.
             verbosity (int, optional): The verbosity level of the log message. Defaults to 0.
         """
-        self.format = format
-        self.code = code
-        self.description = description
-        self.level = level
+        self.format = sys.intern(format)
+        self.code = sys.intern(code)
+        self.description = sys.intern(description)
+        self.level = Level[level] if isinstance(level, str) else level
         self.verbosity = verbosity
 
-    def log(self, *args, **kwargs) -> str:  # type: ignore
+        self._level_value = int(self.level)
+        self._is_static = "{" not in format and "}" not in format
+        self._chunks = _parse_format(format)
+        self._prefix = f"{self.level}: "
+        self._suffix = f" ({code})"
+        self._static_output = self._prefix + format + self._suffix
+        self._hits = 0
+        self._emit: EmitFunction = self._compile_emit()
+
+    def _compile_emit(self, specialized: bool = False) -> EmitFunction:
         """
-        Logs the message with the given arguments.
+        Generates the function that formats and writes this message.
+        The renderer and precomputed strings are bound as constants, and formats
+        without placeholders use the precomputed output and line without rendering.
 
         Args:
-            *args: Positional arguments to format the message.
-            **kwargs: Keyword arguments to format the message.
+            specialized (bool, optional): Whether to inline the parsed format as an
+                f-string instead of calling the generic renderer. Defaults to False.
 
         Returns:
-            str: The formatted log message.
+            EmitFunction: A function taking the format args, format kwargs and a
+            LogCtrl, and returning the formatted log message.
         """
-        message = self.format.format(*args, **kwargs)  # type: ignore
+        namespace: dict[str, Any] = {
+            "sys": sys,
+            "CODE": self.code,
+            "RENDER_OUTPUT": self._render_output,
+            "PREFIX": self._prefix,
+            "SUFFIX": self._suffix,
+            "STATIC_OUTPUT": self._static_output,
+            "STATIC_LINE": self._static_output + "\n",
+        }
+        if self._is_static:
+            render, line = _STATIC_RENDER, _STATIC_LINE
+        elif specialized:
+            render, line = self._fstring_source(namespace), _FORMAT_LINE
+        else:
+            render, line = _FORMAT_RENDER, _FORMAT_LINE
+        source = _EMIT_SOURCE.format(render=render, line=line)
+        exec(compile(source, f"<logaroo message {self.code}>", "exec"), namespace)
+        return namespace["_emit"]
 
-        output = f"{self.level}: {message} ({self.code})"
+    def _fstring_source(self, namespace: dict[str, Any]) -> str:
+        """
+        Builds the source of an f-string rendering this message's output from its parsed chunks.
+        Literal text, keyword names and format specs are bound into the namespace,
+        so the source only contains names and argument lookups.
 
-        max_messages_reached = bool(kwargs.get("max_messages_reached", False))  # type: ignore
-        max_messages: int = int(kwargs.get("max_messages", 0))  # type: ignore
+        Args:
+            namespace (dict): The globals of the function being generated.
 
-        max_messages_previously_met_for_code: bool = bool(
-            kwargs.get("max_messages_previously_met_for_code", False)  # type: ignore
-        )
+        Returns:
+            str: The f-string source.
+        """
+        pieces = ["{PREFIX}"]
+        for index, (literal, kind, key, conversion, format_spec) in enumerate(
+            self._chunks or []
+        ):
+            if literal:
+                namespace[f"L{index}"] = literal
+                pieces.append(f"{{L{index}}}")
+            if kind == TEXT:
+                continue
 
-        if max_messages_previously_met_for_code:
-            output_to_print = ""
-        else:
-            if max_messages_reached:
-                output_to_print = f"WARNING: Maximum number of messages ({max_messages}) reached for code {self.code}."
+            if kind == POS:
+                field = f"args[{key}]"
             else:
-                output_to_print = output
+                namespace[f"K{index}"] = key
+                field = f"kwargs[K{index}]"
+            if conversion:
+                field += f"!{conversion}"
+            if format_spec:
+                namespace[f"S{index}"] = format_spec
+                field += f":{{S{index}}}"
+            pieces.append("{" + field + "}")
+        pieces.append("{SUFFIX}")
+        return 'f"' + "".join(pieces) + '"'
 
-        timestamp: str | None = kwargs.get("timestamp")  # type: ignore
+    def render(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        """
+        Formats the message text from its pre-parsed chunks, without re-parsing the format.
+        Formats without placeholders are returned as they are.
 
-        if timestamp:
-            output = f"{timestamp} - {output}"
-            output_to_print = f"{timestamp} - {output_to_print}"
+        Args:
+            args (tuple): Positional arguments to format the message.
+            kwargs (dict): Keyword arguments to format the message.
 
-        if output_to_print != "":
-            stdout: bool = bool(kwargs.get("stdout", True))  # type: ignore
-            if stdout:
-                print(output_to_print)
+        Returns:
+            str: The formatted message text, without level, code or timestamp.
+        """
+        if self._is_static:
+            return self.format
 
-            file_handle: StringIO = kwargs.get("file_handle")  # type: ignore
-            if file_handle:
-                file_handle.write(output_to_print + "\n")
-                file_handle.flush()
+        parts: list[str] = []
+        self._render_parts(parts, args, kwargs)
+        return "".join(parts)
 
-        return output
+    def _render_output(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+        """
+        Formats the message text between its level prefix and code suffix.
+        All pieces go into one list and are joined once, without intermediate strings.
+        After HOT_MESSAGE_THRESHOLD calls, the message switches to a specialized emit function.
+
+        Args:
+            args (tuple): Positional arguments to format the message.
+            kwargs (dict): Keyword arguments to format the message.
+
+        Returns:
+            str: The formatted log message, without timestamp.
+        """
+        self._hits += 1
+        if self._hits == HOT_MESSAGE_THRESHOLD and self._chunks is not None:
+            self._emit = self._compile_emit(specialized=True)
+
+        parts = [self._prefix]
+        self._render_parts(parts, args, kwargs)
+        parts.append(self._suffix)
+        return "".join(parts)
+
+    def _render_parts(
+        self, parts: list[str], args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> None:
+        """
+        Appends the pieces of the formatted message text to a list.
+        Each field is looked up by its pre-parsed kind, without going through str.format.
+
+        Args:
+            parts (list[str]): The list to append to.
+            args (tuple): Positional arguments to format the message.
+            kwargs (dict): Keyword arguments to format the message.
+        """
+        chunks = self._chunks
+        if chunks is None:
+            parts.append(self.format.format(*args, **kwargs))
+            return
+
+        for literal, kind, key, conversion, format_spec in chunks:
+            parts.append(literal)
+            if kind == POS:
+                value = args[key]
+            elif kind == KW:
+                value = kwargs[key]
+            else:
+                continue
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            parts.append(format(value, format_spec))
+
+    def log(self, *args, **kwargs) -> str:  # type: ignore
+        """
+        Logs the message with the given arguments.
+        Keyword arguments matching a LogCtrl field are used as control state
+        instead of being passed to the format.
+
+        Args:
+            *args: Positional arguments to format the message.
+            **kwargs: Keyword arguments to format the message.
+
+        Returns:
+            str: The formatted log message.
+        """
+        ctrl = LogCtrl(
+            **{key: kwargs.pop(key) for key in LogCtrl._fields if key in kwargs}
+        )
+        return self._emit(args, kwargs, ctrl)
 
     def to_dict(self) -> dict[str, Any]:
         """
@@ -1,5 +1,6 @@
 # type: ignore
 import filecmp
+import gc
 from io import StringIO
 import os
 from tempfile import TemporaryDirectory
@@ -17,6 +18,7 @@ class TestLogger(unittest.TestCase):
         self.logger: Logger = Logger(
             name="TestLogger",
             verbosity=1,
+            retain_entries=True,
         )
 
         self.logger.add_message(
@@ -74,6 +76,29 @@ class TestLogger(unittest.TestCase):
         self.assertEqual(len(self.logger.messages), 6)
         self.assertEqual(self.logger.filename, None)
 
+    def test_messages_not_shared(self):
+        # Test that a new logger does not see messages added to another logger
+        logger = Logger(name="OtherLogger")
+        self.assertEqual(len(logger.messages), 0)
+        with self.assertRaises(LogarooMissingCodeException):
+            logger.log("TEST-001", "Hello, World!")
+
+    def test_level_names(self):
+        # Test that levels can be given by name
+        logger = Logger(name="TestLogger", level="ERROR", verbosity=1)
+        logger.add_message(
+            format="Test message: {}",
+            code="TEST-001",
+            description="This is a test message.",
+            level="CRITICAL",
+            verbosity=1,
+        )
+        self.assertEqual(logger.level, Level.ERROR)
+        self.assertEqual(next(iter(logger.messages)).level, Level.CRITICAL)
+        self.assertFalse(logger.disabled_for("TEST-001"))
+        logger.level = "DEBUG"
+        self.assertEqual(logger.level, Level.DEBUG)
+
     def test_log(self):
         # Test that stdout contains the expected message
         with patch("sys.stdout", new_callable=StringIO) as f:
@@ -95,6 +120,31 @@ class TestLogger(unittest.TestCase):
             output = f.getvalue().strip()
         self.assertEqual(output, "")
 
+    def test_disabled_for(self):
+        # Test that disabled_for reports which codes would be dropped
+        self.assertFalse(self.logger.disabled_for("TEST-001"))
+        self.assertTrue(self.logger.disabled_for("TEST-003"))
+        self.assertTrue(self.logger.disabled_for("TEST-004"))
+        with self.assertRaises(LogarooMissingCodeException):
+            self.logger.disabled_for("TEST-999")
+
+    def test_log_to_stream(self):
+        # Test that messages go to the given stream instead of stdout
+        stream = StringIO()
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            stream=stream,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            logger.log("TEST-001", "Hello, World!")
+            output = f.getvalue()
+        self.assertEqual(output, "")
+        self.assertEqual(
+            stream.getvalue(), "INFO: Test message: Hello, World! (TEST-001)\n"
+        )
+
     def test_log_to_file(self):
         # Create a temporary directory
         with TemporaryDirectory() as tempdir:
@@ -140,11 +190,36 @@ class TestLogger(unittest.TestCase):
             "CRITICAL: value 42 is larger than 24 (TEST-006)",
         )
 
+    def test_log_with_control_named_arguments(self):
+        # Test that named arguments sharing a name with control state are formatted
+        self.logger.add_message(
+            format="Started at {timestamp} with stdout={stdout}",
+            code="TEST-007",
+            description="Testing format with names used by the control state.",
+            level=Level.INFO,
+            verbosity=1,
+        )
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            self.logger.log("TEST-007", timestamp="noon", stdout="on")
+            output = f.getvalue().strip()
+        self.assertEqual(
+            output,
+            "INFO: Started at noon with stdout=on (TEST-007)",
+        )
+
     def test_missing_code_exception(self):
         # Test that a missing code raises an exception
         with self.assertRaises(LogarooMissingCodeException):
             self.logger.log("TEST-999")
 
+    def test_exception_messages(self):
+        # Test that exceptions describe the offending code
+        missing = LogarooMissingCodeException("TEST-999")
+        duplicate = LogarooDuplicateCodeException("TEST-001")
+        self.assertEqual(str(missing), "logging code 'TEST-999' is missing.")
+        self.assertEqual(str(duplicate), "logging code 'TEST-001' is duplicated.")
+        self.assertEqual(missing.message, str(missing))
+
     def test_file_only(self):
         # Test that the logger only logs to a file
         with TemporaryDirectory() as tempdir:
@@ -169,12 +244,176 @@ class TestLogger(unittest.TestCase):
                 output[0], "INFO: Test message: Hello, World! (TEST-001)\n"
             )
 
+    def test_flush(self):
+        # Test that buffered messages reach the log file on flush
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+            )
+            logger.add_messages(self.logger.messages)
+            logger.log("TEST-001", "Hello, World!")
+            logger.flush()
+
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output, ["INFO: Test message: Hello, World! (TEST-001)\n"]
+            )
+            logger.close()
+
+    def test_buffer_size(self):
+        # Test that messages stay buffered until the buffer fills up
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+                buffer_size=100,
+                max_messages=1000,
+            )
+            logger.add_messages(self.logger.messages)
+            logger.log("TEST-001", "Hello, World!")
+            with open(filename, "r") as f:
+                self.assertEqual(f.read(), "")
+
+            for _ in range(500):
+                logger.log("TEST-002", "Hello, World!")
+            with open(filename, "r") as f:
+                self.assertNotEqual(f.read(), "")
+            logger.close()
+
+    def test_flush_each(self):
+        # Test that every message reaches the log file when flush_each is set
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+                flush_each=True,
+            )
+            logger.add_messages(self.logger.messages)
+            logger.log("TEST-001", "Hello, World!")
+
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output, ["INFO: Test message: Hello, World! (TEST-001)\n"]
+            )
+            logger.close()
+
+    def test_close(self):
+        # Test that close writes pending messages and stops logging to the file
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+            )
+            logger.add_messages(self.logger.messages)
+            logger.log("TEST-001", "Hello, World!")
+            logger.close()
+            logger.close()
+            logger.log("TEST-002", "Hello, World!")
+
+            self.assertIsNone(logger.file_handle)
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output, ["INFO: Test message: Hello, World! (TEST-001)\n"]
+            )
+
+    def test_async_write(self):
+        # Test that messages written from the background thread reach the file in order
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+                async_write=True,
+            )
+            logger.add_messages(self.logger.messages)
+            logger.log("TEST-001", "Hello, World!")
+            logger.flush()
+
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output, ["INFO: Test message: Hello, World! (TEST-001)\n"]
+            )
+
+            for i in range(50):
+                logger.log("TEST-002", i)
+            logger.close()
+
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output[1:],
+                [f"ERROR: Test message: {i} (TEST-002)\n" for i in range(50)],
+            )
+
+    def test_async_write_error(self):
+        # Test that a write error in the background thread is raised in the caller
+        with TemporaryDirectory() as tempdir:
+            filename = f"{tempdir}/test.log"
+            logger = Logger(
+                name="TestLogger",
+                verbosity=1,
+                filename=filename,
+                stdout=False,
+                async_write=True,
+            )
+            logger.add_messages(self.logger.messages)
+            writer = logger.file_handle
+            logger.log("TEST-001", "Before")
+            logger.log("TEST-001", "\ud800")
+            with self.assertRaises(UnicodeEncodeError):
+                logger.flush()
+            logger.log("TEST-001", "After")
+            logger.flush()
+            logger.close()
+
+            self.assertTrue(writer.file_handle.closed)
+            with open(filename, "r") as f:
+                output = f.readlines()
+            self.assertEqual(
+                output,
+                [
+                    "INFO: Test message: Before (TEST-001)\n",
+                    "INFO: Test message: After (TEST-001)\n",
+                ],
+            )
+
+    def test_failed_init_cleanup(self):
+        # Test that a logger that failed to initialize is discarded without errors
+        with patch("sys.unraisablehook") as unraisablehook:
+            with self.assertRaises(KeyError):
+                Logger(name="TestLogger", level="BOGUS")
+            with TemporaryDirectory() as tempdir:
+                with self.assertRaises(OSError):
+                    Logger(name="TestLogger", filename=f"{tempdir}/missing/test.log")
+            gc.collect()
+        unraisablehook.assert_not_called()
+
     def test_log_with_timestamp(self):
         # Test that the logger includes a timestamp in the log messages
         logger = Logger(
             name="TestLogger",
             verbosity=1,
             with_timestamp=True,
+            retain_entries=True,
         )
         logger.add_messages(self.logger.messages)
         with patch("sys.stdout", new_callable=StringIO) as f:
@@ -188,6 +427,61 @@ class TestLogger(unittest.TestCase):
             f"{timestamp} - INFO: Test message: Hello, World! (TEST-001)",
         )
 
+    def test_timestamp_cached_per_second(self):
+        # Test that the formatted timestamp is reused within the same second
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            with_timestamp=True,
+        )
+        with patch("time.time_ns", return_value=1_700_000_000_100_000_000):
+            first = logger._get_timestamp()
+        with patch("time.time_ns", return_value=1_700_000_000_900_000_000):
+            second = logger._get_timestamp()
+        with patch("time.time_ns", return_value=1_700_000_001_000_000_000):
+            third = logger._get_timestamp()
+        self.assertIs(first, second)
+        self.assertNotEqual(first, third)
+
+    def test_log_without_timestamp(self):
+        # Test that entries have no timestamp and filtered messages are not recorded
+        with patch("sys.stdout", new_callable=StringIO):
+            self.logger.log("TEST-001", "Hello, World!")
+            self.logger.log("TEST-004", "Hello, World!")
+        self.assertEqual(len(self.logger.entries), 1)
+        self.assertIsNone(self.logger.entries[-1].timestamp)
+
+    def test_log_without_timestamp_skips_clock(self):
+        # Test that the clock is not read when timestamps are disabled
+        with patch("time.time_ns") as time_ns:
+            with patch("sys.stdout", new_callable=StringIO):
+                self.logger.log("TEST-001", "Hello, World!")
+        time_ns.assert_not_called()
+
+    def test_entries_built_once(self):
+        # Test that entries are kept between accesses and extended with new logs
+        with patch("sys.stdout", new_callable=StringIO):
+            self.logger.log("TEST-001", "First")
+            first = self.logger.entries[0]
+            self.logger.log("TEST-001", "Second")
+        entries = self.logger.entries
+        self.assertIs(entries[0], first)
+        self.assertEqual(entries[1].output, "INFO: Test message: Second (TEST-001)")
+
+    def test_entries_not_retained(self):
+        # Test that entries are not kept by default, while the summary still counts them
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO):
+            logger.log("TEST-001", "Hello, World!")
+            logger.log("TEST-002", "Hello, World!")
+        self.assertEqual(logger.entries, [])
+        self.assertIn("TEST-001: Test message: {} = 1", logger.get_summary())
+        self.assertIn("TEST-002: Test message: {} = 1", logger.get_summary())
+
     def test_max_messages(self):
         # Test that the logger limits the number of messages logged per code
         logger = Logger(
@@ -209,6 +503,80 @@ class TestLogger(unittest.TestCase):
             + "WARNING: Maximum number of messages (2) reached for code TEST-001.\n",
         )
 
+    def test_max_messages_unlimited(self):
+        # Test that a maximum of -1 logs every message without a warning
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            max_messages=-1,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            for i in range(150):
+                logger.log("TEST-001", i)
+            output = f.getvalue().splitlines()
+
+        self.assertEqual(
+            output, [f"INFO: Test message: {i} (TEST-001)" for i in range(150)]
+        )
+        self.assertFalse(logger.disabled_for("TEST-001"))
+
+    def test_max_messages_summary_counts(self):
+        # Test that the summary counts calls dropped after the maximum was reported
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            max_messages=2,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO):
+            for i in range(10):
+                logger.log("TEST-001", i)
+        summary = logger.get_summary()
+
+        self.assertIn("  INFO = 10\n", summary)
+        self.assertIn("  TEST-001: Test message: {} = 10", summary)
+
+    def test_max_messages_drops_entries(self):
+        # Test that messages after the maximum was reported are not recorded
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            max_messages=2,
+            retain_entries=True,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO):
+            for i in range(5):
+                logger.log("TEST-001", f"Hello, World! {i}")
+            logger.log("TEST-002", "Hello, World!")
+
+        self.assertEqual(
+            [entry.message.code for entry in logger.entries],
+            ["TEST-001", "TEST-001", "TEST-001", "TEST-002"],
+        )
+
+    def test_max_messages_with_timestamp(self):
+        # Test that suppressed messages print nothing, not even a timestamp
+        logger = Logger(
+            name="TestLogger",
+            verbosity=1,
+            with_timestamp=True,
+            max_messages=1,
+        )
+        logger.add_messages(self.logger.messages)
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            for i in range(3):
+                logger.log("TEST-001", f"Hello, World! {i}")
+            output = f.getvalue().splitlines()
+
+        self.assertEqual(len(output), 2)
+        self.assertTrue(
+            output[1].endswith(
+                " - WARNING: Maximum number of messages (1) reached for code TEST-001."
+            )
+        )
+
     def test_duplicate_code_exception(self):
         # Test that a duplicate code raises an exception
         with self.assertRaises(LogarooDuplicateCodeException):
@@ -220,6 +588,14 @@ class TestLogger(unittest.TestCase):
                 verbosity=1,
             )
 
+    def test_add_messages_duplicate_code_exception(self):
+        # Test that a duplicate code in a batch raises and adds none of the batch
+        logger = Logger(name="TestLogger")
+        messages = list(self.logger.messages)
+        with self.assertRaises(LogarooDuplicateCodeException):
+            logger.add_messages(messages + [messages[0]])
+        self.assertEqual(len(logger.messages), 0)
+
     def test_get_summary(self):
         # Test that the logger returns a summary of the logged message entries
         with patch("sys.stdout", new_callable=StringIO) as f:
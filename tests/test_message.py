@@ -1,8 +1,9 @@
 from io import StringIO
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from src.logaroo import Message
+from src.logaroo import Level, Message
+from src.logaroo.message import HOT_MESSAGE_THRESHOLD
 
 
 class TestMessage(unittest.TestCase):
@@ -19,7 +20,7 @@ class TestMessage(unittest.TestCase):
         self.assertEqual(self.message.format, "Test message: {}")
         self.assertEqual(self.message.code, "TEST-001")
         self.assertEqual(self.message.description, "This is a test message.")
-        self.assertEqual(self.message.level, "INFO")
+        self.assertEqual(self.message.level, Level.INFO)
         self.assertEqual(self.message.verbosity, 1)
 
     def test_log(self):
@@ -28,3 +29,127 @@ class TestMessage(unittest.TestCase):
             self.message.log("Hello, World!")
             output = f.getvalue().strip()
         self.assertEqual(output, "INFO: Test message: Hello, World! (TEST-001)")
+
+    def test_log_static_format(self):
+        # Test that a format without placeholders is logged as-is
+        message = Message(
+            format="Static message",
+            code="TEST-002",
+            description="This is a static message.",
+            level="INFO",
+        )
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            message.log()
+            output = f.getvalue().strip()
+        self.assertEqual(output, "INFO: Static message (TEST-002)")
+        self.assertIs(message.render(("ignored",), {}), message.format)
+
+    def test_log_escaped_braces(self):
+        # Test that escaped braces are still formatted
+        message = Message(
+            format="Escaped {{braces}}",
+            code="TEST-003",
+            description="This is a message with escaped braces.",
+            level="INFO",
+        )
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            message.log()
+            output = f.getvalue().strip()
+        self.assertEqual(output, "INFO: Escaped {braces} (TEST-003)")
+
+    def test_render(self):
+        # Test that pre-parsed formats render like str.format
+        message = Message(
+            format="{0!r} is {1:>4} and {name:.2f}",
+            code="TEST-004",
+            description="This is a message with conversions and specs.",
+            level="INFO",
+        )
+        self.assertEqual(
+            message.render(("a", 7), {"name": 1.5}), "'a' is    7 and 1.50"
+        )
+
+    def test_render_fallback(self):
+        # Test that formats with attribute and index lookups fall back to str.format
+        message = Message(
+            format="{0.real} and {1[0]}",
+            code="TEST-005",
+            description="This is a message with field lookups.",
+            level="INFO",
+        )
+        self.assertEqual(message.render((3, [4]), {}), "3 and 4")
+
+    def test_log_hot_message(self):
+        # Test that a frequently logged message keeps its output once specialized
+        message = Message(
+            format="{0!r} is {1:>4} and {name}",
+            code="TEST-006",
+            description="This is a frequently logged message.",
+            level="INFO",
+        )
+        with patch("sys.stdout", new_callable=StringIO) as f:
+            for _ in range(HOT_MESSAGE_THRESHOLD + 1):
+                message.log("a", 7, name="b")
+            output = f.getvalue().splitlines()
+        self.assertEqual(set(output), {"INFO: 'a' is    7 and b (TEST-006)"})
+        self.assertEqual(len(output), HOT_MESSAGE_THRESHOLD + 1)
+
+    def test_log_single_write_per_sink(self):
+        # Test that each log line is written to each sink in one call, newline included
+        for timestamp, max_messages_reached, expected in [
+            (None, False, "INFO: Hello (TEST-008)\n"),
+            (
+                "2024-01-01T00:00:00",
+                False,
+                "2024-01-01T00:00:00 - INFO: Hello (TEST-008)\n",
+            ),
+            (
+                None,
+                True,
+                "WARNING: Maximum number of messages (1) reached for code TEST-008.\n",
+            ),
+        ]:
+            message = Message(
+                format="{}",
+                code="TEST-008",
+                description="This is a message written to two sinks.",
+                level="INFO",
+            )
+            stream, file_handle = Mock(), Mock()
+            message.log(
+                "Hello",
+                stream=stream,
+                file_handle=file_handle,
+                timestamp=timestamp,
+                max_messages=1,
+                max_messages_reached=max_messages_reached,
+            )
+            stream.write.assert_called_once_with(expected)
+            file_handle.write.assert_called_once_with(expected)
+
+    def test_log_without_stdout(self):
+        # Test that logging is a no-op for stdout when sys.stdout is None
+        message = Message(
+            format="{}",
+            code="TEST-009",
+            description="This is a message logged without a stdout.",
+            level="INFO",
+        )
+        with patch("sys.stdout", None):
+            output = message.log("Hello")
+        self.assertEqual(output, "INFO: Hello (TEST-009)")
+
+    def test_strings_interned(self):
+        # Test that messages built from equal strings share the same objects
+        first, second = (
+            Message(
+                format="".join(["Shared ", "{}"]),
+                code="".join(["TEST-", "007"]),
+                description="".join(["Shared ", "description."]),
+                level="INFO",
+            )
+            for _ in range(2)
+        )
+        self.assertIs(first.format, second.format)
+        self.assertIs(first.code, second.code)
+        self.assertIs(first.description, second.description)